@@ -6,16 +6,13 @@
 #   • 色付きセル（背景色・文字色が白以外）の行はすべて除外
 ###############################################################################
 import os
-import io
 import datetime
 import logging
-import pandas as pd
 
 from common_utils import (
-    download_excel,
+    load_stage_due,
     send_email,
     should_alert,
-    rows_to_skip_by_color,
 )
 
 RECIPIENT_KEY = "EMAIL_EIGYO"
@@ -31,19 +28,19 @@ COL_CHECK  = 5   # F列: チェック (TRUE/FALSE)
 COL_DUE    = 19  # T列: 縫製納期
 
 def fetch_items() -> list[dict]:
-    raw = download_excel(FILE_PATH)
-    if not raw:
+    # ① Excel → DataFrame（全工程列の共通キャッシュから取得）
+    df = load_stage_due(
+        FILE_PATH, SHEET_NAME,
+        {"brand": COL_BRAND, "person": COL_PERSON, "item": COL_ITEM,
+         "check": COL_CHECK},
+        due_col=COL_DUE,
+    )
+    if df is None:
         return []
-
-    # ① Excel → DataFrame
-    df = pd.read_excel(io.BytesIO(raw), sheet_name=SHEET_NAME, header=None)
-    df = df.iloc[7:, [COL_BRAND, COL_PERSON, COL_ITEM, COL_CHECK, COL_DUE]]
-    df.columns = ["brand", "person", "item", "check", "due"]
-    df["due"] = pd.to_datetime(df["due"], errors="coerce").dt.date
+    df["due"] = df["due"].dt.date
 
     # ② 色付きセルを除外
-    skip = rows_to_skip_by_color(raw, SHEET_NAME, COL_DUE)
-    df = df.reset_index(drop=True).loc[~df.index.isin(skip)]
+    df = df.loc[~df["skip_due"]]
 
     # ③ F列 TRUE を優先
     truthy = {"true", "1", "yes", "y", "✓"}
@@ -1,6 +1,6 @@
-import os, io, datetime, logging, pandas as pd
+import os, datetime, logging
 from common_utils import (
-    download_excel, send_email, should_alert, rows_to_skip_by_color,
+    load_stage_due, send_email, should_alert,
 )
 
 RECIPIENT_KEY = "EMAIL_SEISAN"
@@ -14,18 +14,18 @@ COL_CHECK, COL_DUE = 5, 15  # F, P
 
 
 def fetch_items() -> list[dict]:
-    raw = download_excel(FILE_PATH)
-    if not raw:
+    df = load_stage_due(
+        FILE_PATH, SHEET_NAME,
+        {"brand": COL_BRAND, "person": COL_PERSON, "item": COL_ITEM,
+         "check": COL_CHECK},
+        due_col=COL_DUE,
+    )
+    if df is None:
         return []
-
-    df = pd.read_excel(io.BytesIO(raw), sheet_name=SHEET_NAME, header=None)
-    df = df.iloc[7:, [COL_BRAND, COL_PERSON, COL_ITEM, COL_CHECK, COL_DUE]]
-    df.columns = ["brand", "person", "item", "check", "due"]
-    df["due"] = pd.to_datetime(df["due"], errors="coerce").dt.date
+    df["due"] = df["due"].dt.date
 
     # ----- 色付きセルを除外 -----------------------------------
-    skip = rows_to_skip_by_color(raw, SHEET_NAME, COL_DUE)
-    df = df.reset_index(drop=True).loc[~df.index.isin(skip)]
+    df = df.loc[~df["skip_due"]]
     # -----------------------------------------------------------
 
     truthy = {"true", "1", "yes", "y", "✓"}
@@ -0,0 +1,221 @@
+###############################################################################
+# 工程タイムラインアラート
+#   • P 職出し / S 裁断 / T 縫製 / V 中上げ / X 納前 / Y 量産 をまとめて判定
+#   • 上流工程の日付が下流工程を追い越した品番（工程順序の逆転）
+#   • 連続する工程間の余裕が TIMELINE_SLACK_DAYS 日以下の品番
+#   • 担当者ごと・日ごとの納期件数が TIMELINE_PILEUP 件以上の集中
+#   • ブックは各アラートと共通のキャッシュから読み込む（追加の解析なし）
+###############################################################################
+import os
+import datetime
+import logging
+
+import numpy as np
+import pandas as pd
+
+from common_utils import (
+    STAGES,
+    STAGE_KEYS,
+    load_schedule,
+    send_email,
+)
+
+RECIPIENT_KEY = "EMAIL_SEISAN"
+ALERT_NAME = "工程タイムライン"
+FILE_PATH = "/生産部/工場予定表(2025)_新レイアウト.xlsx"
+SHEET_NAME = "25AW"
+
+# 0‑index 列マッピング（各アラートと同じ → 同じキャッシュを共有）
+COL_BRAND  = 3   # D列: ブランド
+COL_PERSON = 2   # C列: 担当者名
+COL_ITEM   = 4   # E列: 品番
+COL_CHECK  = 5   # F列: チェック (TRUE/FALSE)
+
+SLACK_DAYS     = int(os.getenv("TIMELINE_SLACK_DAYS", 1))    # 余裕がこの日数以下なら通知
+PILEUP_COUNT   = int(os.getenv("TIMELINE_PILEUP", 5))        # 1 人 1 日あたりの件数上限
+HORIZON_DAYS   = int(os.getenv("TIMELINE_HORIZON_DAYS", 14)) # 集中判定の対象期間
+
+STAGE_NAMES = [name for _, name, _ in STAGES]
+
+
+def _load_frame() -> pd.DataFrame | None:
+    df = load_schedule(
+        FILE_PATH, SHEET_NAME,
+        {"brand": COL_BRAND, "person": COL_PERSON, "item": COL_ITEM,
+         "check": COL_CHECK},
+    )
+    if df is None:
+        return None
+
+    # 色付きセルは「日付なし」として扱う
+    for key in STAGE_KEYS:
+        df[key] = df[key].mask(df[f"skip_{key}"])
+
+    # F列 TRUE を優先して品番ごとに 1 行
+    truthy = {"true", "1", "yes", "y", "✓"}
+    df["priority"] = (
+        df["check"].astype(str).str.strip().str.lower().isin(truthy).astype(int)
+    )
+    df = df.sort_values(["item", "priority"], ascending=[True, False])
+    df = df.drop_duplicates(subset="item", keep="first")
+    df = df.dropna(subset=STAGE_KEYS, how="all")
+
+    for col in ("brand", "person", "item"):
+        df[col] = (
+            df[col].fillna("").astype(str).str.strip()
+            .replace({"": "不明", "nan": "不明"})
+        )
+    return df.reset_index(drop=True)
+
+
+def fetch_timeline() -> dict[str, list[dict]]:
+    """
+    全工程列を 1 回のベクトル演算で判定して
+      violations / tight / pileups の 3 区分を返す。
+    """
+    result: dict[str, list[dict]] = {"violations": [], "tight": [], "pileups": []}
+    df = _load_frame()
+    if df is None or df.empty:
+        return result
+
+    today = np.datetime64(datetime.date.today(), "D")
+    dates = df[STAGE_KEYS].to_numpy(dtype="datetime64[D]")   # 品番 × 工程
+    valid = ~np.isnat(dates)
+    n_stage = dates.shape[1]
+
+    # ① 直前に日付のある上流工程の列番号（無ければ -1）
+    last = np.maximum.accumulate(
+        np.where(valid, np.arange(n_stage), -1), axis=1
+    )
+    prev_idx = np.concatenate(
+        [np.full((len(df), 1), -1), last[:, :-1]], axis=1
+    )
+    has_prev = valid & (prev_idx >= 0)
+    prev = np.take_along_axis(dates, np.maximum(prev_idx, 0), axis=1)
+
+    # ② 工程間の余裕（日）― 負なら上流が下流を追い越している
+    slack = np.where(has_prev, (dates - prev).astype("timedelta64[D]").astype(float), np.nan)
+
+    # 逆転はどちらかの工程が未到来なら対象（下流の日付が過ぎていても上流が遅れていれば通知）
+    open_pair = has_prev & ((dates >= today) | (prev >= today))
+    violation = open_pair & (slack < 0)
+    # 余裕は下流側の日付が今日以降のペアだけを見る
+    upcoming = has_prev & (dates >= today)
+    tight = upcoming & (slack >= 0) & (slack <= SLACK_DAYS)
+
+    for key, mask in (("violations", violation), ("tight", tight)):
+        rows, cols = np.nonzero(mask)
+        for i, j in zip(rows, cols):
+            k = prev_idx[i, j]
+            result[key].append(
+                {
+                    "brand":  df.at[i, "brand"],
+                    "person": df.at[i, "person"],
+                    "item":   df.at[i, "item"],
+                    "up":     STAGE_NAMES[k],
+                    "down":   STAGE_NAMES[j],
+                    "up_due":   prev[i, j].astype(datetime.date),
+                    "down_due": dates[i, j].astype(datetime.date),
+                    "slack":  int(slack[i, j]),
+                }
+            )
+
+    # ③ 担当者 × 日 の件数（全工程を縦持ちにして集計）
+    in_window = valid & (dates >= today) & (dates <= today + HORIZON_DAYS)
+    rows, cols = np.nonzero(in_window)
+    stacked = pd.DataFrame(
+        {
+            "person": df["person"].to_numpy()[rows],
+            "due":    dates[rows, cols],
+            "stage":  np.asarray(STAGE_NAMES)[cols],
+        }
+    )
+    counts = stacked.groupby(["person", "due"], dropna=False).agg(
+        count=("stage", "size"),
+        stages=("stage", lambda s: s.value_counts(sort=False).to_dict()),
+    )
+    for (person, due), r in counts[counts["count"] >= PILEUP_COUNT].iterrows():
+        result["pileups"].append(
+            {
+                "person": person,
+                "due":    pd.Timestamp(due).date(),
+                "count":  int(r["count"]),
+                "stages": r["stages"],
+            }
+        )
+    return result
+
+
+def _group_lines(rows: list[dict], fmt) -> list[str]:
+    tree: dict[str, dict[str, list[str]]] = {}
+    for r in rows:
+        tree.setdefault(r["person"], {}).setdefault(r["brand"], []).append(fmt(r))
+
+    body = []
+    for person, brands in tree.items():
+        body.append(f"【担当: {person}】")
+        for brand, items in brands.items():
+            body.append(f"*〔{brand}〕*")
+            body.extend(items)
+            body.append("")
+    return body
+
+
+def build_body(result: dict[str, list[dict]]) -> str:
+    header = [f"【{ALERT_NAME}アラート】", ""]
+    if not any(result.values()):
+        return "\n".join(header + ["該当する品番はありません。"])
+
+    body = header[:]
+    if result["violations"]:
+        body += ["■ 工程順序の逆転（上流が下流より後）", ""]
+        body += _group_lines(
+            result["violations"],
+            lambda r: (
+                f"⚠️ 品番: {r['item']} — {r['up']} ({r['up_due']:%Y-%m-%d}) が "
+                f"{r['down']} ({r['down_due']:%Y-%m-%d}) より {abs(r['slack'])} 日遅い"
+            ),
+        )
+        body.append("")
+
+    if result["tight"]:
+        body += [f"■ 工程間の余裕 {SLACK_DAYS} 日以下", ""]
+        body += _group_lines(
+            result["tight"],
+            lambda r: (
+                f"• 品番: {r['item']} — {r['up']} → {r['down']} 余裕 {r['slack']} 日 "
+                f"({r['down_due']:%Y-%m-%d})"
+            ),
+        )
+        body.append("")
+
+    if result["pileups"]:
+        body += [f"■ 納期の集中（1 日 {PILEUP_COUNT} 件以上）", ""]
+        by_person: dict[str, list[str]] = {}
+        for r in result["pileups"]:
+            detail = " / ".join(f"{s} {n}" for s, n in r["stages"].items())
+            by_person.setdefault(r["person"], []).append(
+                f"• {r['due']:%Y-%m-%d} — {r['count']} 件（{detail}）"
+            )
+        for person, lines in by_person.items():
+            body.append(f"【担当: {person}】")
+            body.extend(lines)
+            body.append("")
+    return "\n".join(body)
+
+
+def run():
+    if RECIPIENT_KEY in os.environ:
+        os.environ["EMAIL_RECIPIENTS"] = os.environ[RECIPIENT_KEY]
+
+    result = fetch_timeline()
+    if not any(result.values()):
+        logging.info("該当する品番がないため、メールを送信しません。")
+        return
+
+    body = build_body(result)
+    send_email(f"[{ALERT_NAME}アラート]", body)
+
+
+if __name__ == "__main__":
+    run()
@@ -2,6 +2,8 @@
 # ---------------------------------------------------------------------------
 # 共有ユーティリティ：
 #   • Dropbox から Excel を取得（download_excel）
+#   • 解析済みシートを Arrow 形式でキャッシュ（load_sheet_columns）
+#   • 全工程列をまとめて読み込み（load_schedule / load_stage_due）
 #   • 行スキップ判定：セルの背景色 or 文字色が白以外なら除外（rows_to_skip_by_color）
 #   • アラート判定（should_alert）
 #   • SMTP 経由でメール送信（send_email）
@@ -9,12 +11,16 @@
 import os
 import io
 import datetime
+import hashlib
+import json
 import logging
 import smtplib
 from email.mime.text import MIMEText
-from typing import Set
+from typing import Iterable, Set
 
 import dropbox
+import pandas as pd
+import pyarrow as pa
 from openpyxl import load_workbook
 
 IS_DRY_RUN = os.getenv("DRY_RUN", "0") == "1"   # ★追加
@@ -39,12 +45,27 @@ def download_excel(path: str) -> bytes | None:
     Dropbox から指定パスのファイルをダウンロードして raw bytes を返す。
     失敗したら None を返す。
     """
+    _, raw = _download_with_rev(path)
+    return raw
+
+
+def _download_with_rev(path: str) -> tuple[str | None, bytes | None]:
+    """download_excel と同じだが、Dropbox の rev も合わせて返す"""
     try:
-        _, res = get_dropbox_client().files_download(path)
+        meta, res = get_dropbox_client().files_download(path)
         logging.info("✅  Dropbox から Excel を取得: %s", path)
-        return res.content
+        return meta.rev, res.content
     except Exception as e:
         logging.error("❌ Dropbox ダウンロード失敗: %s", e)
+        return None, None
+
+
+def get_file_rev(path: str) -> str | None:
+    """ファイル本体を落とさずに Dropbox の rev だけ取得。失敗したら None"""
+    try:
+        return get_dropbox_client().files_get_metadata(path).rev
+    except Exception as e:
+        logging.warning("⚠️ Dropbox メタデータ取得失敗: %s", e)
         return None
 
 
@@ -59,24 +80,253 @@ def _is_skip_color(argb: str | None) -> bool:
     """openpyxl の ARGB 8桁 or RGB 6桁を受け取り、対象色なら True"""
     if argb is None:
         return False
-    return argb[-6:].upper() in SKIP_BG_HEX      # 下 6 桁で比較
+    return argb[-6:].lower() in {h.lower() for h in SKIP_BG_HEX}  # 下 6 桁で比較（大小文字は区別しない）
 
 def rows_to_skip_by_color(raw_bytes: bytes, sheet_name: str,
                           target_col: int,
                           first_data_row_excel: int = 8) -> set[int]:
-    from openpyxl import load_workbook
+    skip = skip_rows_by_color_multi(
+        raw_bytes, sheet_name, {"target": target_col}, first_data_row_excel
+    )
+    return skip["target"]
+
+
+def skip_rows_by_color_multi(raw_bytes: bytes, sheet_name: str,
+                             target_cols: dict[str, int],
+                             first_data_row_excel: int = 8) -> dict[str, set[int]]:
+    """rows_to_skip_by_color の複数列版（ブックの読み込みは 1 回だけ）"""
     wb = load_workbook(io.BytesIO(raw_bytes), data_only=True)
     ws = wb[sheet_name]
 
-    skip = set()
+    skip: dict[str, set[int]] = {name: set() for name in target_cols}
     for df_row_idx, row in enumerate(ws.iter_rows(min_row=first_data_row_excel), 0):
-        cell = row[target_col]
-        bg_rgb = getattr(cell.fill.fgColor, "rgb", None)
-        if _is_skip_color(bg_rgb):
-            skip.add(df_row_idx)
+        for name, col in target_cols.items():
+            if col >= len(row):
+                continue
+            bg_rgb = getattr(row[col].fill.fgColor, "rgb", None)
+            if _is_skip_color(bg_rgb):
+                skip[name].add(df_row_idx)
     return skip
 
 
+# ──────────────────────────────────────────────────────────────────────
+# 解析結果キャッシュ（Arrow IPC / memory-map）
+#   • キー = Dropbox rev + シート名 + 列マッピング
+#   • 同じ rev なら別プロセス・別アラートでも xlsx の再デコード不要
+#   • 古いファイルは件数 / 合計サイズの上限で削除（mtime の古い順）
+# ──────────────────────────────────────────────────────────────────────
+PARSED_CACHE_DIR       = os.getenv(
+    "PARSED_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "nouki-alert"),
+)
+PARSED_CACHE_MAX_FILES = int(os.getenv("PARSED_CACHE_MAX_FILES", 16))
+PARSED_CACHE_MAX_MB    = int(os.getenv("PARSED_CACHE_MAX_MB", 256))
+
+_SKIP_PREFIX = "skip_"
+
+# _parse_sheet_columns の出力（正規化・フラグ）を変えたら上げる → 旧キャッシュは無効
+_PARSED_CACHE_VERSION = 2
+
+
+def _parsed_cache_path(file_path: str, rev: str, sheet_name: str,
+                       columns: dict[str, int], date_cols: Iterable[str],
+                       skip_cols: Iterable[str],
+                       first_data_row_excel: int) -> str:
+    key = json.dumps(
+        {
+            "path":  file_path,
+            "rev":   rev,
+            "sheet": sheet_name,
+            "cols":  sorted(columns.items()),
+            "dates": sorted(date_cols),
+            "skip":  sorted(skip_cols),
+            "row":   first_data_row_excel,
+            "color": sorted(h.lower() for h in SKIP_BG_HEX),
+            "ver":   _PARSED_CACHE_VERSION,
+        },
+        ensure_ascii=False,
+    )
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(PARSED_CACHE_DIR, f"{digest}.arrow")
+
+
+def _read_parsed_cache(cache_path: str) -> pa.Table | None:
+    try:
+        with pa.memory_map(cache_path, "r") as src:
+            table = pa.ipc.open_file(src).read_all()
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logging.warning("⚠️ 解析キャッシュ読込失敗（再解析します）: %s", e)
+        return None
+
+    try:
+        os.utime(cache_path)                       # LRU 用に mtime 更新
+    except OSError:
+        pass                                       # 読み取り専用でも読めた結果は使う
+    return table
+
+
+def _write_parsed_cache(cache_path: str, table: pa.Table):
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(PARSED_CACHE_DIR, exist_ok=True)
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, cache_path)           # 他プロセスから半端なファイルを見せない
+    except Exception as e:
+        logging.warning("⚠️ 解析キャッシュ書込失敗: %s", e)
+        try:
+            os.remove(tmp_path)                    # 書きかけの一時ファイルを残さない
+        except OSError:
+            pass
+        return
+    _evict_parsed_cache()
+
+
+def _evict_parsed_cache():
+    """件数 / 合計サイズの上限を超えた分を mtime の古い順に削除"""
+    try:
+        entries = []
+        for name in os.listdir(PARSED_CACHE_DIR):
+            if not name.endswith(".arrow"):
+                continue
+            st = os.stat(os.path.join(PARSED_CACHE_DIR, name))
+            entries.append((st.st_mtime, st.st_size, name))
+    except OSError:
+        return
+
+    entries.sort(reverse=True)                     # 新しい順
+    max_bytes = PARSED_CACHE_MAX_MB * 1024 * 1024
+    total = 0
+    for i, (_, size, name) in enumerate(entries):
+        total += size
+        if i < PARSED_CACHE_MAX_FILES and (i == 0 or total <= max_bytes):
+            continue
+        try:
+            os.remove(os.path.join(PARSED_CACHE_DIR, name))
+        except OSError:
+            pass
+
+
+def _parse_sheet_columns(raw: bytes, sheet_name: str, columns: dict[str, int],
+                         date_cols: Iterable[str], skip_cols: Iterable[str],
+                         first_data_row_excel: int) -> pa.Table:
+    """xlsx を解析して列抽出・日付正規化・色スキップフラグ付与まで行う"""
+    df = pd.read_excel(io.BytesIO(raw), sheet_name=sheet_name, header=None)
+    df = df.iloc[first_data_row_excel - 1:, list(columns.values())]
+    df.columns = list(columns.keys())
+    df = df.reset_index(drop=True)
+
+    date_cols = set(date_cols)
+    for name in columns:
+        if name in date_cols:
+            df[name] = pd.to_datetime(df[name], errors="coerce").dt.normalize()
+        else:
+            # 型の混在（数値 / 文字列）を Arrow に載せるため文字列化（欠損は null）
+            df[name] = df[name].map(lambda v: None if pd.isna(v) else str(v))
+
+    skip = skip_rows_by_color_multi(
+        raw, sheet_name,
+        {name: columns[name] for name in skip_cols},
+        first_data_row_excel,
+    )
+    for name, rows in skip.items():
+        df[f"{_SKIP_PREFIX}{name}"] = df.index.isin(rows)
+
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def load_sheet_columns(file_path: str, sheet_name: str, columns: dict[str, int],
+                       date_cols: Iterable[str] = (),
+                       skip_cols: Iterable[str] = (),
+                       first_data_row_excel: int = 8) -> pd.DataFrame | None:
+    """
+    Excel の指定列を DataFrame で返す（解析結果は rev 単位でキャッシュ）。
+      • columns   : {列名: 0-index 列番号}
+      • date_cols : datetime64（日単位）に正規化する列名
+      • skip_cols : 背景色フラグを付ける列名 → "skip_<列名>" 列（bool）
+    取得失敗時は None。
+    """
+    date_cols, skip_cols = tuple(date_cols), tuple(skip_cols)
+    cache_args = (sheet_name, columns, date_cols, skip_cols, first_data_row_excel)
+
+    table = None
+    rev = get_file_rev(file_path)
+    if rev:
+        table = _read_parsed_cache(_parsed_cache_path(file_path, rev, *cache_args))
+        if table is not None:
+            logging.info("✅  解析キャッシュを使用: %s (rev=%s)", file_path, rev)
+
+    if table is None:
+        rev, raw = _download_with_rev(file_path)
+        if not raw:
+            return None
+        table = _parse_sheet_columns(raw, sheet_name, columns, date_cols,
+                                     skip_cols, first_data_row_excel)
+        if rev:
+            _write_parsed_cache(_parsed_cache_path(file_path, rev, *cache_args), table)
+
+    df = table.to_pandas()
+    for name in columns:
+        if name not in date_cols:
+            df[name] = df[name].where(df[name].notna(), float("nan"))
+    return df
+
+
+# ──────────────────────────────────────────────────────────────────────
+# 全工程スケジュール
+#   • 各アラートは全工程列をまとめた共通マッピングで load_sheet_columns を呼ぶ
+#     → 同じ rev なら xlsx のデコードは全スクリプト合わせて 1 回
+# ──────────────────────────────────────────────────────────────────────
+# (キー, 表示名, 0-index 列番号) ― 上流 → 下流の順
+STAGES = [
+    ("syokudasi", "生産職出し", 15),  # P
+    ("saidan",    "裁断",       18),  # S
+    ("housei",    "縫製",       19),  # T
+    ("nakaage",   "中上げ",     21),  # V
+    ("noumae",    "納前",       23),  # X
+    ("nouki",     "量産",       24),  # Y
+]
+STAGE_KEYS = [key for key, _, _ in STAGES]
+
+
+def load_schedule(file_path: str, sheet_name: str,
+                  columns: dict[str, int]) -> pd.DataFrame | None:
+    """
+    columns（brand / person など）＋ 全工程の納期列をまとめて返す。
+    工程列は datetime64、色フラグは "skip_<工程キー>"。
+    """
+    schedule = {**columns, **{key: col for key, _, col in STAGES}}
+    return load_sheet_columns(
+        file_path, sheet_name, schedule,
+        date_cols=STAGE_KEYS, skip_cols=STAGE_KEYS,
+    )
+
+
+def load_stage_due(file_path: str, sheet_name: str,
+                   columns: dict[str, int], due_col: int) -> pd.DataFrame | None:
+    """
+    load_schedule の結果から 1 工程分を "due" / "skip_due" として返す。
+    due_col が STAGES に無い場合は単独で読み込む。
+    """
+    stage = next((key for key, _, col in STAGES if col == due_col), None)
+    if stage is None:
+        return load_sheet_columns(
+            file_path, sheet_name, {**columns, "due": due_col},
+            date_cols=["due"], skip_cols=["due"],
+        )
+
+    df = load_schedule(file_path, sheet_name, columns)
+    if df is None:
+        return None
+    out = df[list(columns)].copy()
+    out["due"]      = df[stage]
+    out["skip_due"] = df[f"{_SKIP_PREFIX}{stage}"]
+    return out
+
+
 # ──────────────────────────────────────────────────────────────────────
 # SMTP メール送信
 # ──────────────────────────────────────────────────────────────────────
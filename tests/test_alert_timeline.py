@@ -0,0 +1,66 @@
+import datetime
+
+import pandas as pd
+
+import alert_timeline
+from common_utils import STAGE_KEYS
+
+TODAY = datetime.date.today()
+
+
+def _day(n: int) -> pd.Timestamp:
+    return pd.Timestamp(TODAY + datetime.timedelta(days=n))
+
+
+def _schedule(rows: list[dict]) -> pd.DataFrame:
+    """load_schedule と同じ形（工程列 = datetime64、skip_<工程> = bool）"""
+    records = []
+    for r in rows:
+        rec = {"brand": "B", "person": r.get("person"), "item": r["item"], "check": "True"}
+        for key in STAGE_KEYS:
+            rec[key] = r.get(key, pd.NaT)
+            rec[f"skip_{key}"] = False
+        records.append(rec)
+    df = pd.DataFrame(records)
+    for key in STAGE_KEYS:
+        df[key] = pd.to_datetime(df[key])
+    return df
+
+
+def _fetch(monkeypatch, rows: list[dict]) -> dict:
+    monkeypatch.setattr(alert_timeline, "load_schedule", lambda *a, **k: _schedule(rows))
+    return alert_timeline.fetch_timeline()
+
+
+def test_reversed_pair_with_past_downstream(monkeypatch):
+    res = _fetch(monkeypatch, [{"item": "A1", "person": "田中",
+                                "syokudasi": _day(10), "saidan": _day(-1)}])
+    assert [(r["item"], r["up"], r["down"], r["slack"]) for r in res["violations"]] == [
+        ("A1", "生産職出し", "裁断", -11)
+    ]
+    assert res["tight"] == []
+
+
+def test_tight_pair(monkeypatch):
+    monkeypatch.setattr(alert_timeline, "SLACK_DAYS", 1)
+    res = _fetch(monkeypatch, [{"item": "A2", "person": "田中",
+                                "saidan": _day(3), "housei": _day(4), "nakaage": _day(9)}])
+    assert res["violations"] == []
+    assert [(r["up"], r["down"], r["slack"]) for r in res["tight"]] == [("裁断", "縫製", 1)]
+
+
+def test_pileup_includes_missing_person(monkeypatch):
+    monkeypatch.setattr(alert_timeline, "PILEUP_COUNT", 6)
+    rows = [{"item": f"N{i}", "person": None, "nouki": _day(2)} for i in range(6)]
+    rows += [{"item": f"T{i}", "person": "田中", "nouki": _day(2)} for i in range(5)]
+    res = _fetch(monkeypatch, rows)
+    assert [(r["person"], r["due"], r["count"]) for r in res["pileups"]] == [
+        ("不明", _day(2).date(), 6)
+    ]
+
+
+def test_empty_window(monkeypatch):
+    res = _fetch(monkeypatch, [{"item": "A3", "person": "田中",
+                                "saidan": _day(-20), "housei": _day(-10)}])
+    assert res == {"violations": [], "tight": [], "pileups": []}
+    assert "該当する品番はありません。" in alert_timeline.build_body(res)
@@ -0,0 +1,141 @@
+import datetime
+import io
+import os
+
+import pandas as pd
+from openpyxl import Workbook
+import pytest
+from openpyxl.styles import PatternFill
+
+import common_utils as cu
+
+SHEET = "25AW"
+COLUMNS = {"brand": 3, "person": 2, "item": 4, "check": 5}
+
+
+def _workbook() -> bytes:
+    wb = Workbook()
+    ws = wb.active
+    ws.title = SHEET
+    ws.cell(1, 1, "工場予定表")
+    for r in range(8, 12):
+        ws.cell(r, 3, "田中")
+        ws.cell(r, 4, "B")
+        ws.cell(r, 5, f"X{r}")
+        for _, _, col in cu.STAGES:
+            ws.cell(r, col + 1, datetime.date(2025, 9, r))
+    ws.cell(10, 19).fill = PatternFill("solid", fgColor="F7DFDF")   # S列
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def test_load_stage_due_matches_single_column(monkeypatch, tmp_path):
+    raw = _workbook()
+    monkeypatch.setattr(cu, "PARSED_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(cu, "get_file_rev", lambda path: "rev1")
+    monkeypatch.setattr(cu, "_download_with_rev", lambda path: ("rev1", raw))
+
+    staged = cu.load_stage_due("/x.xlsx", SHEET, COLUMNS, due_col=18)
+    single = cu.load_sheet_columns(
+        "/x.xlsx", SHEET, {**COLUMNS, "due": 18},
+        date_cols=["due"], skip_cols=["due"],
+    )
+
+    pd.testing.assert_series_equal(staged["due"], single["due"])
+    pd.testing.assert_series_equal(staged["skip_due"], single["skip_due"])
+    assert staged["skip_due"].tolist() == [False, False, True, False]
+
+
+@pytest.fixture
+def dropbox_stub(monkeypatch, tmp_path):
+    """Dropbox を差し替え、ダウンロード回数を記録する（rev は state["rev"]）"""
+    raw = _workbook()
+    state = {"rev": "rev1", "downloads": 0}
+
+    def download(path):
+        state["downloads"] += 1
+        return state["rev"], raw
+
+    monkeypatch.setattr(cu, "PARSED_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(cu, "get_file_rev", lambda path: state["rev"])
+    monkeypatch.setattr(cu, "_download_with_rev", download)
+    return state
+
+
+def _load(columns=None):
+    return cu.load_sheet_columns(
+        "/x.xlsx", SHEET, columns or {**COLUMNS, "due": 18},
+        date_cols=["due"], skip_cols=["due"],
+    )
+
+
+def test_cache_hit_skips_download(dropbox_stub, tmp_path):
+    first = _load()
+    assert dropbox_stub["downloads"] == 1
+    assert len([n for n in os.listdir(tmp_path) if n.endswith(".arrow")]) == 1
+
+    second = _load()
+    assert dropbox_stub["downloads"] == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_cache_miss_on_new_rev_or_columns(dropbox_stub):
+    _load()
+    dropbox_stub["rev"] = "rev2"
+    _load()
+    assert dropbox_stub["downloads"] == 2
+
+    _load({**COLUMNS, "due": 19})
+    assert dropbox_stub["downloads"] == 3
+
+
+def test_cache_miss_on_skip_color_change(dropbox_stub, monkeypatch):
+    _load()
+    monkeypatch.setattr(cu, "SKIP_BG_HEX", {"ffff00"})
+    assert not _load()["skip_due"].any()
+    assert dropbox_stub["downloads"] == 2
+
+
+def test_corrupt_cache_is_reparsed(dropbox_stub, tmp_path):
+    first = _load()
+    (path,) = [tmp_path / n for n in os.listdir(tmp_path) if n.endswith(".arrow")]
+    path.write_bytes(path.read_bytes()[:20])        # 途中で切れたファイル
+
+    second = _load()
+    assert dropbox_stub["downloads"] == 2
+    pd.testing.assert_frame_equal(first, second)
+
+
+def _write_entries(tmp_path, sizes: list[int]) -> list[str]:
+    names = []
+    for i, size in enumerate(sizes):
+        path = tmp_path / f"{i}.arrow"
+        path.write_bytes(b"x" * size)
+        os.utime(path, (1000 + i, 1000 + i))        # 番号が大きいほど新しい
+        names.append(path.name)
+    return names
+
+
+def test_evict_enforces_max_files(monkeypatch, tmp_path):
+    monkeypatch.setattr(cu, "PARSED_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(cu, "PARSED_CACHE_MAX_FILES", 2)
+    _write_entries(tmp_path, [10, 10, 10, 10])
+    cu._evict_parsed_cache()
+    assert sorted(os.listdir(tmp_path)) == ["2.arrow", "3.arrow"]
+
+
+def test_evict_enforces_max_mb_but_keeps_newest(monkeypatch, tmp_path):
+    mb = 1024 * 1024
+    monkeypatch.setattr(cu, "PARSED_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(cu, "PARSED_CACHE_MAX_MB", 1)
+    _write_entries(tmp_path, [mb // 2, mb // 2, mb // 2])
+    cu._evict_parsed_cache()
+    assert sorted(os.listdir(tmp_path)) == ["1.arrow", "2.arrow"]
+
+    # 上限を超える 1 件でも最新は残す
+    for name in os.listdir(tmp_path):
+        os.remove(tmp_path / name)
+    _write_entries(tmp_path, [mb, 2 * mb])
+    cu._evict_parsed_cache()
+    assert os.listdir(tmp_path) == ["1.arrow"]